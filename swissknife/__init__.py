@@ -0,0 +1,2 @@
+from swissknife.core import *  # noqa: F401,F403
+from swissknife.core import main  # noqa: F401
@@ -0,0 +1,700 @@
+import argparse
+import functools
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger("swissknife")
+
+
+@functools.lru_cache(maxsize=None)
+def safe_import(module_name, package_name=None):
+    try:
+        if package_name:
+            imported_module = __import__(module_name, fromlist=[package_name])
+            return imported_module
+        imported_module = __import__(module_name)
+        return imported_module
+    except ImportError:
+        logger.error(f"Error: Module {module_name} not found. Please install it using pip.")
+        if package_name:
+            logger.error(f"Error: Try: pip install {package_name}")
+        else:
+            logger.error(f"Error: Try: pip install {module_name}")
+        logger.error(f"Error: This module is required for the requested operation.")
+        sys.exit(1)
+
+
+_DOC_EXTS = frozenset({".pdf", ".docx", ".doc", ".txt", ".md", ".epub", ".pptx", ".xlsx"})
+_IMG_EXTS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff"})
+_AUDIO_EXTS = frozenset({".mp3", ".wav", ".flac", ".aac", ".ogg", ".m4a"})
+_VIDEO_EXTS = frozenset({".mp4", ".avi", ".mkv", ".mov", ".wmv", ".flv", ".webm"})
+_ARCHIVE_EXTS = frozenset({".zip", ".tar", ".gz", ".bz2", ".7z", ".rar"})
+
+_EXT_TO_TYPE = {ext: ftype for ftype, exts in (("document", _DOC_EXTS), ("image", _IMG_EXTS), ("audio", _AUDIO_EXTS), ("video", _VIDEO_EXTS), ("archive", _ARCHIVE_EXTS)) for ext in exts}
+
+_SUPPORTED_CONVERSIONS = {"document": frozenset({".pdf", ".docx", ".doc", ".txt", ".md", ".epub", ".pptx", ".html", ".tex", ".xml", ".bib", ".json", ".rst", ".rtf", ".odt", ".org", ".ipynb", ".fb2", ".icml", ".opml", ".texi", ".textile", ".typ", ".muse", ".hs", ".1", ".adoc", ".dj", ".ms"}), "image": frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff", ".pdf"}), "audio": _AUDIO_EXTS, "video": _VIDEO_EXTS | {".gif"}, "archive": _ARCHIVE_EXTS}
+
+
+def detect_file_type(file_path):
+    if not file_path:
+        return "unknown"
+    if not os.path.exists(file_path):
+        return "unknown"
+    return _EXT_TO_TYPE.get(os.path.splitext(str(file_path))[1].lower(), "unknown")
+
+
+def is_conversion_supported(input_type, output_ext):
+    if input_type == "unknown" or not output_ext: return False
+    return output_ext in _SUPPORTED_CONVERSIONS.get(input_type, frozenset())
+
+
+def _fast_copy(src, dst):
+    # Try in-kernel copies first: copy_file_range is a reflink/CoW clone on
+    # supporting filesystems, sendfile avoids the userspace bounce buffer.
+    size = os.path.getsize(src)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        for copier in ("copy_file_range", "sendfile"):
+            try:
+                remaining = size
+                while remaining > 0:
+                    if copier == "copy_file_range": sent = os.copy_file_range(src_fd, dst_fd, remaining)
+                    else: sent = os.sendfile(dst_fd, src_fd, size - remaining, remaining)
+                    if sent == 0: break
+                    remaining -= sent
+                if remaining == 0: return dst
+            except (AttributeError, OSError): pass
+            fsrc.seek(0); fdst.seek(0); fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, length=4 * 1024 * 1024)
+    return dst
+
+
+def validate_files(input_path, output_path, force=False):
+    # No interactive prompt here: workers in a process pool have no usable stdin,
+    # so an existing output either fails fast or is clobbered under --force.
+    input_abs, output_abs = Path(input_path).resolve(), Path(output_path).resolve()
+    if not input_abs.exists(): raise FileNotFoundError(f"Input file {input_abs} does not exist.")
+    if output_abs.exists():
+        if not force: raise FileExistsError(f"Output file {output_abs} exists (use --force to overwrite).")
+        output_abs.unlink()
+    output_abs.parent.mkdir(parents=True, exist_ok=True); return str(input_abs), str(output_abs)
+
+
+def _run_ffmpeg(cmd, timeout=None):
+    # -progress/-nostats are global options; slot them in right after "-y" so they
+    # are not mistaken for trailing per-output options.
+    import select
+    if timeout is None:
+        timeout = float(os.environ.get("SWISSKNIFE_FFMPEG_TIMEOUT", 0)) or None
+    # stderr spools to an unlinked temp file rather than a pipe: nothing to
+    # drain during the encode, but the diagnostic survives for failures.
+    stderr_spool = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd[:2] + ["-progress", "pipe:1", "-nostats", "-loglevel", "error"] + cmd[2:], stdout=subprocess.PIPE, stderr=stderr_spool, text=True, bufsize=1)
+    start_time = time.time()
+    def abort():
+        proc.terminate()
+        try: proc.wait(5)
+        except subprocess.TimeoutExpired: proc.kill(); proc.wait()
+        print(); raise subprocess.TimeoutExpired(cmd, timeout)
+    while True:
+        # select() bounds every wait on the pipe, so the timeout fires even if
+        # ffmpeg wedges without emitting a single progress line.
+        if not select.select([proc.stdout], [], [], 1.0)[0]:
+            if timeout and time.time() - start_time > timeout: abort()
+            continue
+        line = proc.stdout.readline()
+        if not line: break
+        if line.startswith("out_time_ms="):
+            try: print(f"\rProgress: {int(line.split('=', 1)[1]) / 1_000_000:.1f}s encoded", end="", flush=True)
+            except ValueError: pass
+        if timeout and time.time() - start_time > timeout: abort()
+    print()
+    try:
+        returncode = proc.wait(timeout=max(1.0, timeout - (time.time() - start_time)) if timeout else None)
+    except subprocess.TimeoutExpired:
+        abort()
+    stderr_spool.seek(0); stderr_tail = stderr_spool.read()[-4096:].decode(errors="replace").strip(); stderr_spool.close()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr_tail)
+
+
+@functools.lru_cache(maxsize=1)
+def _pandoc_exe():
+    return safe_import("pypandoc").get_pandoc_path()
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_exe():
+    return os.environ.get("SWISSKNIFE_FFMPEG") or safe_import("imageio_ffmpeg").get_ffmpeg_exe()
+
+
+_HW_H264_ENCODERS = {"nvenc": "h264_nvenc", "qsv": "h264_qsv", "vaapi": "h264_vaapi", "videotoolbox": "h264_videotoolbox"}
+
+
+@functools.lru_cache(maxsize=1)
+def _available_encoders():
+    try:
+        out = subprocess.run([_ffmpeg_exe(), "-hide_banner", "-encoders"], capture_output=True, text=True, check=True).stdout
+    except Exception:
+        return frozenset()
+    return frozenset(parts[1] for line in out.splitlines() if len(parts := line.split()) > 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder_works(encoder):
+    # -encoders only reports what the build compiled in, not what the machine
+    # can run (static builds list nvenc/vaapi on GPU-less boxes); a one-frame
+    # trial encode to the null muxer is the only reliable probe.
+    prefix = ["-vaapi_device", "/dev/dri/renderD128"] if encoder == "h264_vaapi" else []
+    vf = ["-vf", "format=nv12,hwupload"] if encoder == "h264_vaapi" else []
+    cmd = [_ffmpeg_exe(), "-hide_banner", "-v", "error"] + prefix + ["-f", "lavfi", "-i", "color=black:s=64x64:d=0.1"] + vf + ["-frames:v", "1", "-c:v", encoder, "-f", "null", "-"]
+    try:
+        return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15).returncode == 0
+    except Exception:
+        return False
+
+
+def _pick_h264_encoder(hw_accel):
+    if hw_accel == "none": return None
+    order = [hw_accel] if hw_accel in _HW_H264_ENCODERS else list(_HW_H264_ENCODERS)
+    available = _available_encoders()
+    for name in order:
+        if _HW_H264_ENCODERS[name] in available and _encoder_works(_HW_H264_ENCODERS[name]): return _HW_H264_ENCODERS[name]
+    return None
+
+
+# 0 lets ffmpeg autodetect; batch_convert overrides this per worker so the pool
+# does not oversubscribe the machine.
+FFMPEG_THREADS = int(os.environ.get("SWISSKNIFE_FFMPEG_THREADS", 0))
+
+
+_NATIVE_AUDIO_CODECS = {".mp3": ("mp3",), ".m4a": ("aac", "alac"), ".aac": ("aac",), ".wav": ("pcm_s16le",), ".ogg": ("vorbis", "opus"), ".flac": ("flac",)}
+
+
+def _probe_audio_codec(input_path):
+    # imageio_ffmpeg ships no ffprobe; the stream line in ffmpeg's own banner
+    # is enough to recognise the source audio codec.
+    import re
+    banner = subprocess.run([_ffmpeg_exe(), "-hide_banner", "-i", input_path], capture_output=True, text=True).stderr
+    match = re.search(r"Audio:\s*(\w+)", banner)
+    return match.group(1) if match else None
+
+
+_REMUX_CONTAINERS = frozenset({".mp4", ".mkv", ".mov"})
+
+
+def _probe_video_codec(input_path):
+    import re
+    banner = subprocess.run([_ffmpeg_exe(), "-hide_banner", "-i", input_path], capture_output=True, text=True).stderr
+    match = re.search(r"Video:\s*(\w+)", banner)
+    return match.group(1) if match else None
+
+
+def _audio_codec_args(output_ext, threads=None):
+    codec_map = {".mp3": ("libmp3lame", "192k"), ".m4a": ("aac", "192k"), ".aac": ("aac", "192k"), ".wav": ("pcm_s16le", None), ".ogg": ("libvorbis", "192k"), ".flac": ("flac", None)}; codec, bitrate = codec_map.get(output_ext, ("aac", "192k")); args = ["-threads", str(threads if threads is not None else FFMPEG_THREADS), "-vn", "-c:a", codec]
+    if bitrate: args += ["-b:a", bitrate]
+    return args
+
+
+def _video_codec_args(output_ext, preset, hw_accel="auto", max_width=1920, max_height=1080, threads=None):
+    fmt_map = {".webm": ("libvpx-vp9", ["-crf", "30", "-b:v", "0", "-row-mt", "1", "-tile-columns", "2", "-cpu-used", "5"], "libopus", ["-b:a", "128k"], []), ".mp4": ("libx264", ["-crf", "23", "-preset", preset], "aac", ["-b:a", "128k"], ["-movflags", "+faststart"]), ".mkv": ("libx264", ["-crf", "23", "-preset", preset], "aac", ["-b:a", "128k"], []), ".avi": ("libx264", ["-crf", "23", "-preset", preset], "aac", ["-b:a", "128k"], []), ".mov": ("libx264", ["-crf", "23", "-preset", preset], "aac", ["-b:a", "128k"], ["-movflags", "+faststart"]), ".flv": ("libx264", ["-crf", "23", "-preset", preset], "aac", ["-b:a", "128k"], [])}; vcodec, vparams, acodec, aparams, fparams = fmt_map.get(output_ext, fmt_map[".mp4"])
+    # Cap frame rate and resolution before the encoder: dropping excess pixels
+    # up front is a near-linear speedup on compute-bound encodes (no upscaling).
+    vf, prefix = f"fps='min(source_fps,30)',scale=w='min(iw,{max_width})':h='min(ih,{max_height})':force_original_aspect_ratio=decrease:force_divisible_by=2", []
+    if vcodec == "libx264":
+        hw = _pick_h264_encoder(hw_accel)
+        if hw == "h264_nvenc": vcodec, vparams = hw, ["-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23"]
+        elif hw == "h264_qsv": vcodec, vparams = hw, ["-global_quality", "23"]
+        elif hw == "h264_videotoolbox": vcodec, vparams = hw, ["-q:v", "55"]
+        elif hw == "h264_vaapi": vcodec, vparams = hw, ["-qp", "23"]; prefix = ["-vaapi_device", "/dev/dri/renderD128"]; vf += ",format=nv12,hwupload"
+        # yuv420p in the same filter pass keeps high-bit-depth/4:4:4 sources
+        # playable on web and hardware decoders; vaapi already uploads nv12.
+        if vcodec != "h264_vaapi": vf += ",format=yuv420p"
+    return prefix + ["-threads", str(threads if threads is not None else FFMPEG_THREADS), "-c:v", vcodec] + vparams + fparams + ["-vf", vf, "-c:a", acodec] + aparams
+
+
+def convert_media(input_path: str, output_path: str, preset: str = "faster", hw_accel: str = "auto", max_width: int = 1920, max_height: int = 1080, threads: int = None, scaler: str = "bicubic"):
+    ffmpeg_exe, output_ext = _ffmpeg_exe(), os.path.splitext(output_path)[1].lower(); Path(output_path).unlink(missing_ok=True)
+    if output_ext == ".gif":
+        # At 480px bicubic is perceptually on par with lanczos at roughly half
+        # the filter-tap cost; zscale routes through libzimg's SIMD kernels.
+        scale = "zscale=w=480:h=-2:f=lanczos" if scaler == "zscale" else f"scale=480:-1:flags={scaler}"
+        _run_ffmpeg([ffmpeg_exe, "-y", "-i", input_path, "-threads", str(threads if threads is not None else FFMPEG_THREADS), "-filter_complex", f"[0:v]fps=10,{scale},split[a][b];[a]palettegen=stats_mode=diff[p];[b][p]paletteuse=dither=bayer:bayer_scale=5", "-r", "10", output_path])
+    elif output_ext in (".mp3", ".wav", ".ogg", ".flac", ".m4a", ".aac"):
+        if _probe_audio_codec(input_path) in _NATIVE_AUDIO_CODECS.get(output_ext, ()):
+            # Source stream is already the target codec: remux instead of re-encoding.
+            _run_ffmpeg([ffmpeg_exe, "-y", "-i", input_path, "-vn", "-c:a", "copy", output_path])
+        else:
+            _run_ffmpeg([ffmpeg_exe, "-y", "-i", input_path] + _audio_codec_args(output_ext, threads) + [output_path])
+    else:
+        input_ext = os.path.splitext(input_path)[1].lower()
+        if input_ext in _REMUX_CONTAINERS and output_ext in _REMUX_CONTAINERS and _probe_video_codec(input_path) in ("h264", "hevc"):
+            # Compatible codec in a compatible container: rewrap the streams
+            # instead of re-encoding; fall through to the encoder if the
+            # container has something the target cannot carry.
+            try:
+                _run_ffmpeg([ffmpeg_exe, "-y", "-i", input_path, "-c", "copy"] + (["-movflags", "+faststart"] if output_ext in (".mp4", ".mov") else []) + [output_path])
+                return
+            except subprocess.CalledProcessError:
+                Path(output_path).unlink(missing_ok=True)
+        # When a hardware encoder is in play the same silicon can usually decode
+        # too, so let ffmpeg offload the decode side as well.
+        hw_encoder = output_ext != ".webm" and _pick_h264_encoder(hw_accel)
+        hw_decode = ["-hwaccel", "auto"] if hw_encoder else []
+        try:
+            _run_ffmpeg([ffmpeg_exe, "-y"] + hw_decode + ["-i", input_path] + _video_codec_args(output_ext, preset, hw_accel, max_width, max_height, threads) + [output_path])
+        except subprocess.CalledProcessError:
+            # The trial probe can pass and the real encode still fail (driver
+            # limits, unsupported profile); software x264 always works.
+            if not hw_encoder: raise
+            logger.error(f"Error: {hw_encoder} failed for {input_path}; retrying with software encoder")
+            Path(output_path).unlink(missing_ok=True)
+            _run_ffmpeg([ffmpeg_exe, "-y", "-i", input_path] + _video_codec_args(output_ext, preset, "none", max_width, max_height, threads) + [output_path])
+
+
+def convert_media_batch(pairs, preset="faster", hw_accel="auto", chunk_size=32):
+    # One ffmpeg process with an input/output group per file amortizes process
+    # startup and codec init across the whole batch; chunking keeps the argv
+    # (and ffmpeg's open-input count) bounded for very large directories.
+    # Returns the pairs from chunks that failed so the caller can retry just
+    # those files; their partial outputs are unlinked here.
+    ffmpeg_exe, failed_pairs = _ffmpeg_exe(), []
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        cmd, tmp_outs = [ffmpeg_exe, "-y"], []
+        for input_path, _ in chunk: cmd += ["-i", input_path]
+        for idx, (_, output_path) in enumerate(chunk):
+            # Encode into a dotted sibling and rename after the chunk succeeds,
+            # so a killed run never leaves partials under the real names.
+            out_dir, out_name = os.path.split(output_path)
+            tmp_out = os.path.join(out_dir, ".partial-" + out_name); tmp_outs.append(tmp_out)
+            output_ext = os.path.splitext(output_path)[1].lower(); Path(output_path).unlink(missing_ok=True)
+            if output_ext in (".mp3", ".wav", ".ogg", ".flac", ".m4a", ".aac"): cmd += ["-map", f"{idx}:a"] + _audio_codec_args(output_ext) + [tmp_out]
+            else: cmd += ["-map", f"{idx}:v", "-map", f"{idx}:a?"] + _video_codec_args(output_ext, preset, hw_accel) + [tmp_out]
+        try:
+            _run_ffmpeg(cmd)
+            for (_, output_path), tmp_out in zip(chunk, tmp_outs): os.replace(tmp_out, output_path)
+        except Exception as e:
+            logger.error(f"Error: Media batch chunk of {len(chunk)} files failed ({e}); its files will be retried individually")
+            for tmp_out in tmp_outs: Path(tmp_out).unlink(missing_ok=True)
+            failed_pairs.extend(chunk)
+    return failed_pairs
+
+
+def batch_convert(input_dir, output_dir, input_ext, output_ext, jobs=None, preset="faster"):
+    jobs = jobs or max(1, (os.cpu_count() or 2) // 2)
+    input_path, output_path = Path(input_dir).resolve(), Path(output_dir).resolve()
+    if not input_path.exists(): raise FileNotFoundError(f"Input directory {input_path} does not exist.")
+    if not input_path.is_dir(): raise ValueError(f"Input path {input_path} is not a directory.")
+    if not input_ext.startswith('.'): input_ext = '.' + input_ext
+    if not output_ext.startswith('.'): output_ext = '.' + output_ext
+    output_path.mkdir(parents=True, exist_ok=True)
+    # os.scandir reads dirents straight off getdents64 without the per-entry
+    # stat() that Path.glob pays for each match.
+    with os.scandir(input_path) as entries:
+        input_names = [entry.name for entry in entries if entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(input_ext.lower())]
+    if not input_names: logger.info(f"Info: No files with extension {input_ext} found in {input_path}"); return
+    # Build each input/output path once as plain strings: per-file Path
+    # arithmetic re-parses and re-joins every operand, which adds up over a
+    # 10k-file directory, and the (in, out) pair is reused by every path below.
+    in_prefix, out_prefix = str(input_path) + os.sep, str(output_path) + os.sep
+    work_items = [(name, in_prefix + name, out_prefix + os.path.splitext(name)[0] + output_ext) for name in input_names]
+    # Already-converted outputs are skipped up front, which makes re-running an
+    # interrupted batch cost only a stat() per finished file.
+    remaining = [item for item in work_items if not os.path.exists(item[2])]
+    skipped_conversions = len(work_items) - len(remaining)
+    if skipped_conversions:
+        work_items = remaining
+        logger.info(f"Info: Skipping {skipped_conversions} files whose output already exists")
+    logger.info(f"Info: Found {len(work_items)} files with extension {input_ext}"); logger.info(f"Info: Converting from {input_path} to {output_path}, {input_ext} → {output_ext}"); successful_conversions, failed_conversions = 0, 0
+    media_exts = _AUDIO_EXTS | _VIDEO_EXTS
+    in_lower, out_lower = input_ext.lower(), output_ext.lower()
+    if in_lower in media_exts and out_lower in media_exts:
+        # convert_file's fast paths (same-format byte copy, stream-copy remux)
+        # beat a fused re-encode, so only genuine transcodes are batched; the
+        # rest fall through to the per-file dispatch below.
+        if in_lower == out_lower:
+            fuse_items = []
+        elif in_lower in _REMUX_CONTAINERS and out_lower in _REMUX_CONTAINERS:
+            fuse_items = [item for item in work_items if _probe_video_codec(item[1]) not in ("h264", "hevc")]
+        elif out_lower in _NATIVE_AUDIO_CODECS:
+            fuse_items = [item for item in work_items if _probe_audio_codec(item[1]) not in _NATIVE_AUDIO_CODECS[out_lower]]
+        else:
+            fuse_items = list(work_items)
+        if fuse_items:
+            try:
+                pairs = [validate_files(in_file, out_file) for _, in_file, out_file in fuse_items]
+                failed_inputs = {in_file for in_file, _ in convert_media_batch(pairs, preset=preset)}
+                successful_conversions = len(pairs) - len(failed_inputs)
+                # Only the files from failed chunks fall through to per-file retry;
+                # finished chunks stay done instead of colliding with their outputs.
+                fused_ok = {item[1] for item in fuse_items if item[1] not in failed_inputs}
+                work_items = [item for item in work_items if item[1] not in fused_ok]
+            except Exception as e:
+                logger.error(f"Error: Single-process media batch failed ({e}); falling back to per-file conversion")
+    # One scratch tempdir for the whole batch: per-file temp space (archive
+    # extraction) nests inside it, replacing N mkdtemp/rmtree pairs with one.
+    with tempfile.TemporaryDirectory(prefix="swissknife-") as scratch:
+        if jobs > 1 and len(work_items) > 1:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+            threads_per_job = max(1, (os.cpu_count() or 2) // jobs)
+            # Media and document conversions are subprocess-bound: each worker just
+            # spawns and babysits ffmpeg/pandoc, so threads overlap the external
+            # processes without per-job fork/pickle overhead. Pillow image work runs
+            # CPU-heavy Python in-process and keeps the process pool.
+            pool_cls = ProcessPoolExecutor if _EXT_TO_TYPE.get(input_ext.lower()) == "image" else ThreadPoolExecutor
+            # Spawned process-pool workers start without handlers; fork inherits
+            # them, so the initializer only matters (and is harmless) elsewhere.
+            with pool_cls(max_workers=jobs, initializer=_setup_logging) as executor:
+                futures = {executor.submit(convert_file, in_file, out_file, True, preset=preset, threads=threads_per_job, scratch=scratch): name for name, in_file, out_file in work_items}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try: future.result(); logger.info(f"Converted: {name} → {os.path.splitext(name)[0] + output_ext}"); successful_conversions += 1
+                    except Exception as e: logger.error(f"Error: Failed to convert {name}: {e}"); failed_conversions += 1
+        else:
+            for name, in_file, out_file in work_items:
+                try: logger.info(f"Converting: {name} → {os.path.splitext(name)[0] + output_ext}"); convert_file(in_file, out_file, preserve_original=True, preset=preset, scratch=scratch); successful_conversions += 1
+                except Exception as e: logger.error(f"Error: Failed to convert {name}: {e}"); failed_conversions += 1; continue
+    logger.info("-" * 50); logger.info(f"Info: Batch conversion completed - Successful: {successful_conversions}"); logger.info(f"Info: Failed: {failed_conversions}"); logger.info(f"Info: Skipped (output exists): {skipped_conversions}"); logger.info(f"Info: Output directory: {output_path}")
+
+
+def _save_image_pdf(img, output_abs):
+    if getattr(img, "n_frames", 1) > 1:
+        # Multi-frame inputs (e.g. multipage TIFF) become one PDF in a single
+        # encode pass. save_all already writes every frame of the base image;
+        # appending them as well would emit each page twice.
+        if img.mode in ("RGB", "L"):
+            img.save(output_abs, "PDF", resolution=100.0, save_all=True)
+        else:
+            from PIL import ImageSequence
+            frames = [frame.convert("RGB") for frame in ImageSequence.Iterator(img)]
+            frames[0].save(output_abs, "PDF", resolution=100.0, save_all=True, append_images=frames[1:])
+        return
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(output_abs, "PDF", resolution=100.0)
+
+
+def _save_image_jpeg(img, output_abs):
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    img.save(output_abs, "JPEG", optimize=True, quality=85, progressive=True, subsampling=2)
+
+
+def _save_image_default(img, output_abs):
+    img.save(output_abs, optimize=True)
+
+
+_IMAGE_SAVERS = {".pdf": _save_image_pdf, ".jpg": _save_image_jpeg, ".jpeg": _save_image_jpeg}
+
+
+_TAR_WRITE_MODES = {".tar": "w", ".gz": "w:gz", ".bz2": "w:bz2"}
+
+
+def _stream_archive(input_path, output_path, output_ext):
+    # Transcode tar/zip-family archives member-by-member without the
+    # extract-to-disk round trip; returns False for formats that need patool.
+    import tarfile, zipfile
+    is_tar_in, is_zip_in = tarfile.is_tarfile(input_path), zipfile.is_zipfile(input_path)
+    if output_ext in _TAR_WRITE_MODES and is_tar_in:
+        with tarfile.open(input_path, "r:*") as src, tarfile.open(output_path, _TAR_WRITE_MODES[output_ext]) as dst:
+            for member in src: dst.addfile(member, src.extractfile(member) if member.isreg() else None)
+        return True
+    if output_ext in _TAR_WRITE_MODES and is_zip_in:
+        with zipfile.ZipFile(input_path) as src, tarfile.open(output_path, _TAR_WRITE_MODES[output_ext]) as dst:
+            for info in src.infolist():
+                if info.is_dir(): continue
+                member = tarfile.TarInfo(info.filename); member.size = info.file_size; member.mtime = time.mktime(info.date_time + (0, 0, -1))
+                with src.open(info) as f: dst.addfile(member, f)
+        return True
+    if output_ext == ".zip" and is_tar_in:
+        with tarfile.open(input_path, "r:*") as src:
+            members = src.getmembers()
+            # zip has no native symlink/device/fifo entries; those sources go
+            # through patool's extract/re-archive path, which preserves them.
+            if any(not (m.isreg() or m.isdir()) for m in members): return False
+            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as dst:
+                for member in members:
+                    if not member.isreg(): continue
+                    # A fresh ZipInfo defaults to ZIP_STORED (the constructor-level
+                    # compression is ignored by open()) and the 1980 epoch; set both.
+                    zinfo = zipfile.ZipInfo(member.name, date_time=time.localtime(member.mtime)[:6]); zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    with src.extractfile(member) as f, dst.open(zinfo, "w") as out: shutil.copyfileobj(f, out, length=1 << 20)
+        return True
+    if output_ext == ".zip" and is_zip_in:
+        with zipfile.ZipFile(input_path) as src, zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.is_dir(): continue
+                zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time); zinfo.compress_type = zipfile.ZIP_DEFLATED
+                with src.open(info) as f, dst.open(zinfo, "w") as out: shutil.copyfileobj(f, out, length=1 << 20)
+        return True
+    return False
+
+
+def convert_file(input_path, output_path, preserve_original=False, password=None, preset="faster", hw_accel="auto", max_width=1920, max_height=1080, threads=None, force=False, scratch=None, scaler="bicubic"):
+    # preserve_original is kept for call-site compatibility but is a no-op:
+    # every backend (pandoc, PIL, ffmpeg, patoolib) only reads the input, so
+    # the original is never at risk and the old defensive copy just doubled I/O.
+    start_time = time.time()
+    tmp_out = None
+    try:
+        input_abs, output_abs = validate_files(input_path, output_path, force=force)
+        input_type = detect_file_type(input_abs)
+        output_ext = os.path.splitext(output_abs)[1].lower()
+        if input_type == "unknown":
+            raise ValueError(f"Unsupported input file type: {input_abs}")
+        if not is_conversion_supported(input_type, output_ext):
+            raise ValueError(f"Cannot convert {input_type} to {output_ext}")
+        logger.info(f"Converting: {input_abs} to {output_abs}")
+        work_path = input_abs
+        input_ext = os.path.splitext(work_path)[1].lower()
+        # Every backend writes a dotted sibling that is renamed into place on
+        # success, so an interrupted run never leaves a half-written file under
+        # the real name for the batch resume check to mistake for a finished one.
+        out_dir, out_name = os.path.split(output_abs)
+        tmp_out = os.path.join(out_dir, ".partial-" + out_name)
+        if input_type == "document":
+            # Shell out to pandoc directly (path resolved once) instead of going
+            # through pypandoc's per-call wrapper; pandoc infers reader/writer
+            # from the file extensions.
+            extra_args = ["--pdf-engine=xelatex"] if output_ext == ".pdf" else []
+            from_args = ["-f", "markdown"] if input_ext == ".txt" else []  # pandoc can't infer a reader from .txt
+            # Discard pandoc's stdout chatter but keep stderr for the error
+            # message; pipe writes we never read are wasted syscalls. No -s:
+            # pypandoc never passed it, and pandoc already goes standalone for
+            # binary writers (pdf/docx/epub), so adding it would change output.
+            result = subprocess.run([_pandoc_exe()] + from_args + [work_path, "-o", tmp_out] + extra_args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"pandoc failed: {result.stderr.strip()}")
+        elif input_type == "image":
+            if input_ext == output_ext or {input_ext, output_ext} == {".jpg", ".jpeg"}:
+                # Same format in and out: a byte copy beats a full decode/re-encode
+                # cycle and is lossless, which re-encoding would not be.
+                _fast_copy(work_path, tmp_out)
+            else:
+                try:
+                    import pyvips  # optional: tiled, SIMD-accelerated decode/encode
+                except ImportError:
+                    pyvips = None
+                if pyvips and output_ext in (".jpg", ".jpeg", ".png", ".webp", ".tiff"):
+                    vips_img = pyvips.Image.new_from_file(work_path, access="sequential")
+                    if output_ext in (".jpg", ".jpeg"): vips_img.write_to_file(tmp_out, Q=85, optimize_coding=True, strip=True)
+                    else: vips_img.write_to_file(tmp_out)
+                else:
+                    PIL = safe_import("PIL", "PIL")
+                    from PIL import Image
+                    img = Image.open(work_path)
+                    if output_ext in (".pdf", ".jpg", ".jpeg"):
+                        img.draft("RGB", img.size)  # lets libjpeg decode straight to RGB; no-op for other formats
+                    _IMAGE_SAVERS.get(output_ext, _save_image_default)(img, tmp_out)
+        elif input_type in ("audio", "video"):
+            if input_ext == output_ext:
+                # Identical container in and out: the bytes are already right.
+                _fast_copy(work_path, tmp_out)
+            else:
+                convert_media(work_path, tmp_out, preset=preset, hw_accel=hw_accel, max_width=max_width, max_height=max_height, threads=threads, scaler=scaler)
+        elif input_type == "archive":
+            if input_ext == output_ext:
+                # Same format in and out: re-compressing would be a 2x-I/O no-op.
+                _fast_copy(work_path, tmp_out)
+            elif not password and _stream_archive(work_path, tmp_out, output_ext):
+                pass
+            else:
+                patoolib = safe_import("patoolib")
+                # Batch mode hands down one shared scratch dir so N files reuse a
+                # single tempdir allocation instead of N mkdtemp/rmtree pairs.
+                temp_extract_dir = tempfile.mkdtemp(dir=scratch)
+                logger.debug("Password: %s", password)
+                try:
+                    patoolib.extract_archive(work_path, outdir=temp_extract_dir, password=password if password else None, interactive=False)
+                    if password:
+                        logger.info(f"Info: Extracting password-protected archive: {work_path}")
+                    patoolib.create_archive(tmp_out, [temp_extract_dir], password=password if password and output_ext not in (".tar", ".tar.gz", "tar.bz2", "tar.xz", ".gz", ".bz2", ".xz") else None)
+                finally:
+                    shutil.rmtree(temp_extract_dir, ignore_errors=True)
+        else:
+            raise ValueError(f"Unsupported file type: {input_type}")
+        os.replace(tmp_out, output_abs)
+        logger.info(f"Success: {input_type.capitalize()} conversion successful: {output_abs}")
+    except Exception as e:
+        if tmp_out: Path(tmp_out).unlink(missing_ok=True)
+        logger.error(f"Error: Conversion failed: {e}")
+        if getattr(e, "stderr", None): logger.error(f"Error: {e.stderr}")
+        raise
+    finally:
+        end_time = time.time()
+        duration = end_time - start_time
+        logger.info(f"Info: Conversion completed in {duration:.2f} seconds.")
+
+
+@functools.lru_cache(maxsize=1)
+def _genai_client():
+    # One client per process: construction re-reads credentials and spins up
+    # an HTTP connection pool, which batch summarization should pay only once.
+    return safe_import("google.genai", "google-generativeai").Client()
+
+
+@functools.lru_cache(maxsize=1)
+def _prompt_template():
+    # Load once and rewrite the {{...}} markers into str.format fields, so each
+    # summarize call is a single C-level substitution instead of two full-string
+    # replace scans plus a disk read.
+    text = Path("./summarize_prompt.txt").read_text(encoding="utf-8")
+    text = text.replace("{", "{{").replace("}", "}}")
+    for field in ("SUMMARY_REQUIREMENTS", "FILE_DETAILS"):
+        text = text.replace("{{{{" + field + "}}}}", "{" + field + "}")
+    return text
+
+
+def summarize(input_path, length="medium"):
+    input_abs = Path(input_path).resolve()
+    logger.info(f"Summarizing: {input_abs.name} ({length} length)")
+    if not input_abs.exists() or not input_abs.is_file(): raise FileNotFoundError(f"Input file {input_abs} does not exist or is not a file.")
+    if "GOOGLE_API_KEY" not in os.environ: raise EnvironmentError("GOOGLE_API_KEY environment variable is not set.")
+    file_size_mb = input_abs.stat().st_size / (1024 * 1024)
+    if file_size_mb > 100: raise ValueError(f"File size ({file_size_mb:.1f}MB) exceeds maximum limit of 100MB")
+    logger.info(f"Info: File validated ({file_size_mb:.1f}MB) - uploading to AI service...")
+    import json
+    genai = safe_import("google.genai", "google-generativeai")
+    client, doc = _genai_client(), None
+    try:
+        doc = client.files.upload(file=input_abs)
+        logger.info("Info: Processing document and generating summary...")
+        configs = {"short": {"description": "a brief summary about the essence of the document in 1 paragraph", "max_tokens": 1500, "temperature": 0.5}, "medium": {"description": "a concise summary about the essence of the document in 2-3 paragraphs", "max_tokens": 2500, "temperature": 0.7}, "long": {"description": "a detailed summary about the essence of the document in 3-4 paragraphs", "max_tokens": 4000, "temperature": 0.8}}
+        config = configs.get(length, configs["medium"])
+        prompt = _prompt_template().format(SUMMARY_REQUIREMENTS=config["description"], FILE_DETAILS=json.dumps(doc.to_json_dict(), separators=(",", ":")))
+        start_time, delay = time.time(), 0.1
+        while True:
+            file_info = client.files.get(name=doc.name)
+            if file_info.state == "ACTIVE": logger.info("Success: Document processed successfully!"); break
+            elif file_info.state == "FAILED": raise RuntimeError("File processing failed")
+            elif file_info.state == "PROCESSING" and time.time() - start_time > 300: raise TimeoutError("File processing timed out")
+            # Exponential backoff: small files finish in well under the old fixed
+            # 2s tick, large ones don't need sub-second polling.
+            time.sleep(delay); delay = min(delay * 1.5, 5.0)
+        response = client.models.generate_content(model="gemini-2.5-flash", contents=[prompt, doc], config=genai.types.GenerateContentConfig(temperature=config["temperature"], top_p=0.9, max_output_tokens=config["max_tokens"]))
+        summary_content = response._get_text()
+        if not summary_content or len(summary_content.strip()) < 10: raise ValueError("Generated summary is empty or too short")
+        logger.info(f"\nGenerated Summary ({len(summary_content)} characters):")
+        logger.info("=" * 60)
+        logger.info(summary_content)
+        logger.info("=" * 60)
+        summary_file = input_abs.with_name(input_abs.stem + "_summary.txt")
+        with open(summary_file, "w", encoding="utf-8") as sf:
+            sf.write(summary_content)
+        logger.info(f"Info: Summary saved to: {summary_file}")
+        return summary_content
+    except Exception as e: raise RuntimeError(f"❌ Error: {type(e).__name__}: {e}") from e
+    finally:
+        if doc:
+            try: client.files.delete(name=doc.name)
+            except Exception: pass
+
+
+def setup_parser():
+    parser = argparse.ArgumentParser(prog="swissknife", usage="swissknife [options]", description="A Swiss Army Knife of command-line tools. Use -h for help.", epilog=("Examples:\n  %(prog)s convert input.docx output.pdf\n  %(prog)s batch-convert ./docs ./output .docx .pdf\n  %(prog)s summarize document.pdf --length medium\n  %(prog)s merge file1.pdf file2.pdf\n  %(prog)s split input.pdf 1-3,5,7-9"), formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", description="Available commands")
+    convert_parser = subparsers.add_parser("convert", help="Convert files between formats")
+    convert_parser.add_argument("input", help="Input file path"); convert_parser.add_argument("output", help="Output file path"); convert_parser.add_argument("--preserve-original", action="store_true", help="Preserve original file"); convert_parser.add_argument("--password", help="Password for encrypted documents or password-protected archives"); convert_parser.add_argument("--preset", choices=["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"], default="faster", help="x264 encoding preset for video outputs (speed vs. size trade-off)"); convert_parser.add_argument("--hw-accel", choices=["auto", "none", "nvenc", "qsv", "vaapi", "videotoolbox"], default="auto", help="Hardware video encoder to prefer when the ffmpeg build supports it"); convert_parser.add_argument("--max-width", type=int, default=1920, help="Maximum output video width; larger sources are downscaled (no upscaling)"); convert_parser.add_argument("--max-height", type=int, default=1080, help="Maximum output video height; larger sources are downscaled (no upscaling)"); convert_parser.add_argument("--force", action="store_true", help="Overwrite the output file if it already exists"); convert_parser.add_argument("--scaler", choices=["lanczos", "bicubic", "bilinear", "zscale"], default="bicubic", help="Scaling filter for GIF output (bicubic is fastest at comparable quality)")
+    batch_parser = subparsers.add_parser("batch-convert", help="Batch convert files of one format from one directory to another directory of another format")
+    batch_parser.add_argument("input_dir", help="Input directory path"); batch_parser.add_argument("output_dir", help="Output directory path"); batch_parser.add_argument("input_ext", help="Input file extension (e.g., .txt or txt)"); batch_parser.add_argument("output_ext", help="Output file extension (e.g., .pdf or pdf)"); batch_parser.add_argument("--jobs", type=int, default=None, help="Number of parallel conversion workers (default: half the CPU cores)"); batch_parser.add_argument("--preset", choices=["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"], default="faster", help="x264 encoding preset for video outputs (speed vs. size trade-off)")
+    summarize_parser = subparsers.add_parser("summarize", help="Summarize text documents")
+    summarize_parser.add_argument("input", help="Input document path"); summarize_parser.add_argument("--length", choices=["short", "medium", "long"], default="medium", help="Summary length")
+    merge_parser = subparsers.add_parser("merge", help="Merge multiple pdf files into one")
+    merge_parser.add_argument("inputs", nargs="+", help="Input PDF files to merge. Space-separated. E.g., file1.pdf file2.pdf")
+    split_parser = subparsers.add_parser("split", help="Split a PDF file into multiple single-page PDFs")
+    split_parser.add_argument("input", help="Input PDF file to split"); split_parser.add_argument("page_ranges", type=str, metavar="PAGE_RANGES", help=("Specify pages to extract using 1-based inclusive ranges separated by commas. " "Examples: '1-3,5,7-9' extracts pages 1 to 3, page 5, and pages 7 to 9."))
+    return parser
+
+
+_PARSER = setup_parser()  # built once at import; argparse tree construction is not free
+
+
+def _apply_memory_limit():
+    # Let the kernel enforce the cap for free instead of polling memory usage;
+    # allocation failures surface naturally as MemoryError.
+    max_mb = os.environ.get("SWISSKNIFE_MAX_MEMORY_MB")
+    if not max_mb or sys.platform == "win32": return
+    try:
+        import resource
+        max_bytes = int(max_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (ValueError, OSError):
+        logger.warning(f"Warning: Could not apply memory limit of {max_mb}MB")
+
+
+def _setup_logging():
+    # One buffered handler instead of a syscall per print; the bare message
+    # format keeps CLI output byte-identical to the old print statements.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def main():
+    parser = _PARSER
+    _setup_logging()
+    _apply_memory_limit()
+    if len(sys.argv) == 1:
+        parser.print_help()
+        sys.exit(1)
+    if len(sys.argv) == 4 and sys.argv[1] == "convert" and not sys.argv[2].startswith("-") and not sys.argv[3].startswith("-"):
+        # Hot path: a plain "convert IN OUT" needs no argparse dispatch at all.
+        args = argparse.Namespace(command="convert", input=sys.argv[2], output=sys.argv[3], preserve_original=False, password=None, preset="faster", hw_accel="auto", max_width=1920, max_height=1080, force=False, scaler="bicubic")
+    else:
+        args = parser.parse_args()
+    try:
+        if args.command == "convert":
+            convert_file(args.input, args.output, preserve_original=getattr(args, "preserve_original", False), password=getattr(args, "password", None), preset=getattr(args, "preset", "faster"), hw_accel=getattr(args, "hw_accel", "auto"), max_width=getattr(args, "max_width", 1920), max_height=getattr(args, "max_height", 1080), force=getattr(args, "force", False), scaler=getattr(args, "scaler", "bicubic"))
+        elif args.command == "batch-convert":
+            batch_convert(args.input_dir, args.output_dir, args.input_ext, args.output_ext, jobs=args.jobs, preset=args.preset)
+        elif args.command == "summarize":
+            summarize(args.input, length=args.length)
+        elif args.command == "merge":
+            PdfWriter = safe_import("pypdf", "pypdf").PdfWriter
+            merger = PdfWriter()
+            for pdf_file in args.inputs:
+                merger.append(pdf_file)
+            input_names = "_".join([Path(f).stem for f in args.inputs])
+            output_file = f"merged_{input_names}.pdf"
+            merger.write(output_file); merger.close();
+            logger.info(f"Success: Merged PDF saved to {output_file}")
+        elif args.command == "split":
+            PdfReader = safe_import("pypdf", "pypdf").PdfReader
+            PdfWriter = safe_import("pypdf", "pypdf").PdfWriter
+            input_pdf = PdfReader(args.input)
+            page_ranges = []
+            for part in args.page_ranges.split(","):
+                if "-" in part:
+                    start, end = map(int, part.split("-"))
+                    page_ranges.append([i for i in range(start - 1, end)])  # because PdfReader is 0-indexed and end is not inclusive #1-3 translates to 0,1,2
+                else:
+                    page_ranges.append([int(part) - 1])
+            logger.info(page_ranges)
+            for idx, pages in enumerate(page_ranges):
+                writer = PdfWriter()
+                for page_num in pages:
+                    if 0 <= page_num < len(input_pdf.pages):
+                        writer.add_page(input_pdf.pages[page_num])
+                    else:
+                        logger.warning(f"Warning: Page {page_num + 1} is out of range.")
+                output_file = f"{Path(args.input).stem}_part{idx + 1}.pdf"
+                with open(output_file, "wb") as out_f:
+                    writer.write(out_f)
+                logger.info(f"Success: Created {output_file} with pages {pages}")
+        else:
+            parser.print_help()
+    except KeyboardInterrupt:
+        logger.error("\nError: Operation cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()